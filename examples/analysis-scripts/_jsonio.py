@@ -0,0 +1,129 @@
+"""
+Shared JSON loading helpers for the TriageIR analysis scripts
+
+orjson is used for parsing when it is installed; otherwise the stdlib json
+module is used. ijson, when installed, lets the scripts stream the large
+arrays of very big scans from disk instead of holding them in memory.
+"""
+
+import json
+import os
+import sys
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it the whole file is loaded
+    ijson = None
+
+# Errors raised for malformed JSON by whichever parser is in use
+JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson is not None else (json.JSONDecodeError,)
+
+# Default size, in MiB, from which files are streamed
+_DEFAULT_STREAM_MIN_MB = 256
+
+def _stream_min_bytes():
+    """Read the streaming threshold from TRIAGEIR_STREAM_MIN_MB, falling back to the default"""
+    value = os.environ.get('TRIAGEIR_STREAM_MIN_MB', '').strip()
+    if not value:
+        return _DEFAULT_STREAM_MIN_MB * 1024 * 1024
+    try:
+        return int(float(value) * 1024 * 1024)
+    except (ValueError, OverflowError):
+        print(f"Warning: ignoring invalid TRIAGEIR_STREAM_MIN_MB value {value!r}; "
+              f"using {_DEFAULT_STREAM_MIN_MB} MiB", file=sys.stderr)
+        return _DEFAULT_STREAM_MIN_MB * 1024 * 1024
+
+# Files at least this large are streamed when ijson is installed. A parsed
+# scan takes several times its file size in memory, but streaming re-parses
+# the file on every pass, so smaller files are faster to load whole.
+# Set TRIAGEIR_STREAM_MIN_MB to change the threshold; fractions are allowed.
+STREAM_MIN_BYTES = _stream_min_bytes()
+
+def should_stream(path):
+    """Check whether a file is big enough to stream and ijson is available to do it"""
+    return ijson is not None and os.path.getsize(path) >= STREAM_MIN_BYTES
+
+def load_json(path):
+    """Load a JSON file, using orjson when it is available"""
+    with open(path, 'rb') as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return json.load(f)
+
+class StreamedArray:
+    """Re-iterable view of a JSON array that is streamed from disk on each pass
+    
+    prefix is the ijson prefix of the array's items, e.g. 'collection_log.item',
+    and length is the number of items, counted when the view was built.
+    """
+    
+    def __init__(self, path, prefix, length):
+        self.path = path
+        self.prefix = prefix
+        self.length = length
+    
+    def __len__(self):
+        return self.length
+    
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            yield from ijson.items(f, self.prefix, use_float=True)
+    
+    def field_values(self, name):
+        """Yield one field of every item, without building the items themselves"""
+        with open(self.path, 'rb') as f:
+            yield from ijson.items(f, f'{self.prefix}.{name}', use_float=True)
+
+# Arrays that can grow with the size of the scan and are streamed rather than loaded
+_STREAMED_ARRAYS = frozenset({
+    'artifacts.running_processes',
+    'artifacts.network_connections',
+    'artifacts.persistence_mechanisms',
+    'artifacts.event_logs.security',
+    'artifacts.event_logs.system',
+    'artifacts.event_logs.application',
+    'artifacts.execution_evidence.prefetch_files',
+    'artifacts.execution_evidence.shimcache_entries',
+    'collection_log'
+})
+
+# ijson events at an array's item prefix that do not start a new item
+_ITEM_CONTINUATION_EVENTS = frozenset({'map_key', 'end_map', 'end_array'})
+
+def stream_json(path):
+    """Load a scan, leaving the large arrays on disk as StreamedArray views
+    
+    Everything else is built in memory as usual. One parse pass both builds
+    that skeleton and counts the items of each streamed array.
+    """
+    builder = ijson.ObjectBuilder()
+    streamed_prefix = None
+    item_prefix = None
+    item_count = 0
+    
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if streamed_prefix is not None:
+                if prefix == item_prefix:
+                    # Every item opens with exactly one event at the item prefix
+                    if event not in _ITEM_CONTINUATION_EVENTS:
+                        item_count += 1
+                elif prefix == streamed_prefix and event == 'end_array':
+                    builder.event('null', StreamedArray(path, item_prefix, item_count))
+                    streamed_prefix = None
+                continue
+            
+            if event == 'start_array' and prefix in _STREAMED_ARRAYS:
+                streamed_prefix = prefix
+                item_prefix = prefix + '.item'
+                item_count = 0
+                continue
+            
+            builder.event(event, value)
+    
+    return builder.value
@@ -16,20 +16,124 @@ import datetime
 from collections import Counter, defaultdict
 from pathlib import Path
 import ipaddress
+import re
+
+from _jsonio import load_json, should_stream, stream_json
+
+# Characters that are unusual in legitimate process names
+_UNUSUAL_NAME_RE = re.compile(r'[@#$%^&*]')
+
+# Common system directories, upper-cased for comparison with upper-cased paths
+_SYSTEM_DIRS = (
+    'C:\\WINDOWS\\SYSTEM32\\',
+    'C:\\WINDOWS\\SYSWOW64\\',
+    'C:\\PROGRAM FILES\\',
+    'C:\\PROGRAM FILES (X86)\\'
+)
+_USERS_DIR = 'C:\\USERS\\'
+_APPDATA_DIR = '\\APPDATA\\'
+
+# Processes using more than 1000MB are reported
+_HIGH_MEMORY_BYTES = 1000 * 1024 * 1024
+
+# IPv4 prefixes that are always private or loopback, checked before parsing
+_PRIVATE_PREFIXES = ('10.', '127.', '169.254.', '192.168.') + tuple(f'172.{n}.' for n in range(16, 32))
+
+# Known good persistence sources, matched anywhere in the source or command
+_KNOWN_GOOD_RE = re.compile(r'microsoft|windows|intel|nvidia|amd|realtek', re.IGNORECASE)
+
+# Security event IDs of interest
+_FAILED_LOGON_EVENT_ID = 4625
+_PRIVILEGE_EVENT_IDS = frozenset((4672, 4673, 4674))
+
+# Temp and download locations that executables are not normally run from
+_TEMP_DOWNLOADS_RE = re.compile(r'temp|downloads', re.IGNORECASE)
+
+# Translation table for escaping text inserted into HTML reports
+_HTML_TRANS = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
+# Static head of the HTML report, emitted verbatim ahead of the per-scan content
+_HTML_REPORT_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>TriageIR Analysis Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .header { background-color: #f0f0f0; padding: 20px; border-radius: 5px; }
+        .section { margin: 20px 0; }
+        .indicator { background-color: #fff3cd; padding: 10px; margin: 5px 0; border-radius: 3px; }
+        .risk-low { color: green; }
+        .risk-medium { color: orange; }
+        .risk-high { color: red; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>TriageIR Analysis Report</h1>"""
+
+def _escape_html(value):
+    """Escape a value for safe inclusion in HTML text or attributes."""
+    return str(value).translate(_HTML_TRANS)
+
+def _process_indicator(pid, name, path, reason):
+    """Build a suspicious_processes indicator entry."""
+    return {'pid': pid, 'name': name, 'path': path, 'reason': reason}
+
+class IndicatorBucket:
+    """Collects indicators, keeping at most `limit` of them but counting all."""
+    
+    __slots__ = ('head', 'count', 'limit')
+    
+    def __init__(self, limit=None):
+        self.head = []
+        self.count = 0
+        self.limit = limit
+    
+    def append(self, indicator):
+        self.count += 1
+        if self.limit is None or len(self.head) < self.limit:
+            self.head.append(indicator)
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return iter(self.head)
 
 class TriageIRAnalyzer:
-    def __init__(self, results_file):
-        """Initialize analyzer with TriageIR results."""
-        with open(results_file, 'r', encoding='utf-8') as f:
-            self.results = json.load(f)
+    def __init__(self, results_file, indicator_limit=None):
+        """Initialize analyzer with TriageIR results.
+
+        For results files big enough to stream, when ijson is available, the
+        large artifact arrays and the collection log are not kept in memory;
+        their items are streamed from disk one at a time as they are analyzed.
+        
+        indicator_limit caps how many suspicious process, external connection
+        and unusual persistence indicators are retained; all of them are still
+        counted. None keeps every indicator.
+        """
+        if should_stream(results_file):
+            self.results = stream_json(results_file)
+        else:
+            self.results = load_json(results_file)
         
         self.indicators = {
-            'suspicious_processes': [],
-            'external_connections': [],
-            'unusual_persistence': [],
-            'execution_anomalies': [],
-            'security_events': [],
-            'errors': []
+            'suspicious_processes': IndicatorBucket(indicator_limit),
+            'external_connections': IndicatorBucket(indicator_limit),
+            'unusual_persistence': IndicatorBucket(indicator_limit),
+            'execution_anomalies': IndicatorBucket(),
+            'security_events': IndicatorBucket(),
+            'errors': IndicatorBucket()
         }
         
         self.stats = {
@@ -39,19 +143,28 @@ class TriageIRAnalyzer:
             'total_events': 0,
             'scan_duration': 0
         }
+        
+        # Total number of indicators across all categories, set by analyze()
+        self.total_indicators = 0
     
     def analyze(self):
         """Perform comprehensive analysis of the results."""
         print("Analyzing TriageIR results...")
         
         self._analyze_metadata()
-        self._analyze_processes()
-        self._analyze_network()
-        self._analyze_persistence()
-        self._analyze_events()
-        self._analyze_execution_evidence()
+        
+        # Every category but execution evidence is required; a missing one
+        # raises KeyError rather than letting a truncated scan look clean
+        artifacts = self.results['artifacts']
+        self._analyze_processes(artifacts['running_processes'])
+        self._analyze_network(artifacts['network_connections'])
+        self._analyze_persistence(artifacts['persistence_mechanisms'])
+        self._analyze_events(artifacts['event_logs'])
+        self._analyze_execution_evidence(artifacts.get('execution_evidence', {}))
         self._analyze_collection_log()
         
+        self.total_indicators = sum(map(len, self.indicators.values()))
+        
         print("Analysis complete.")
     
     def _analyze_metadata(self):
@@ -66,75 +179,55 @@ class TriageIRAnalyzer:
                 'message': f"Unusually long scan duration: {metadata['scan_duration_ms']}ms"
             })
     
-    def _analyze_processes(self):
+    def _analyze_processes(self, processes):
         """Analyze running processes for suspicious indicators."""
-        processes = self.results['artifacts']['running_processes']
         self.stats['total_processes'] = len(processes)
-        
-        # Common system directories
-        system_dirs = [
-            'C:\\Windows\\System32\\',
-            'C:\\Windows\\SysWOW64\\',
-            'C:\\Program Files\\',
-            'C:\\Program Files (x86)\\'
-        ]
+        add_indicator = self.indicators['suspicious_processes'].append
+        has_unusual_chars = _UNUSUAL_NAME_RE.search
         
         for process in processes:
+            pid = process['pid']
+            name = process['name']
+            path = process.get('executable_path') or ''
+            
             # Check for processes outside system directories
-            exe_path = process.get('executable_path', '').upper()
-            if exe_path and not any(exe_path.startswith(d.upper()) for d in system_dirs):
-                if not exe_path.startswith('C:\\USERS\\') or '\\APPDATA\\' not in exe_path:
-                    self.indicators['suspicious_processes'].append({
-                        'pid': process['pid'],
-                        'name': process['name'],
-                        'path': process['executable_path'],
-                        'reason': 'Unusual location'
-                    })
+            exe_path = path.upper()
+            if exe_path and not exe_path.startswith(_SYSTEM_DIRS):
+                if not exe_path.startswith(_USERS_DIR) or _APPDATA_DIR not in exe_path:
+                    add_indicator(_process_indicator(pid, name, path, 'Unusual location'))
             
             # Check for processes without executable paths
-            if not exe_path and process['name'] not in ['System', '[System Process]']:
-                self.indicators['suspicious_processes'].append({
-                    'pid': process['pid'],
-                    'name': process['name'],
-                    'path': process['executable_path'],
-                    'reason': 'No executable path'
-                })
+            if not exe_path and name not in ('System', '[System Process]'):
+                add_indicator(_process_indicator(pid, name, path, 'No executable path'))
             
             # Check for processes with unusual names
-            name = process['name'].lower()
-            if any(char in name for char in ['@', '#', '$', '%', '^', '&', '*']):
-                self.indicators['suspicious_processes'].append({
-                    'pid': process['pid'],
-                    'name': process['name'],
-                    'path': process['executable_path'],
-                    'reason': 'Unusual characters in name'
-                })
+            if has_unusual_chars(name):
+                add_indicator(_process_indicator(pid, name, path, 'Unusual characters in name'))
             
             # Check for high memory usage
-            memory_mb = process.get('memory_usage', 0) / (1024 * 1024)
-            if memory_mb > 1000:  # > 1GB
-                self.indicators['suspicious_processes'].append({
-                    'pid': process['pid'],
-                    'name': process['name'],
-                    'path': process['executable_path'],
-                    'reason': f'High memory usage: {memory_mb:.1f}MB'
-                })
+            memory_usage = process.get('memory_usage', 0)
+            if memory_usage > _HIGH_MEMORY_BYTES:
+                memory_mb = memory_usage / (1024 * 1024)
+                add_indicator(_process_indicator(pid, name, path, f'High memory usage: {memory_mb:.1f}MB'))
     
-    def _analyze_network(self):
+    def _analyze_network(self, connections):
         """Analyze network connections for suspicious activity."""
-        connections = self.results['artifacts']['network_connections']
         self.stats['total_connections'] = len(connections)
+        ip_address = ipaddress.ip_address
+        add_indicator = self.indicators['external_connections'].append
         
         for conn in connections:
             remote_addr = conn['remote_address']
             if ':' in remote_addr:
-                ip_part = remote_addr.split(':')[0]
+                ip_part = remote_addr.split(':', 1)[0]
                 
-                # Skip local addresses
+                # Skip local addresses, cheaply by prefix where possible
+                if ip_part.startswith(_PRIVATE_PREFIXES):
+                    continue
                 try:
-                    ip = ipaddress.ip_address(ip_part)
+                    ip = ip_address(ip_part)
                     if not ip.is_private and not ip.is_loopback:
-                        self.indicators['external_connections'].append({
+                        add_indicator({
                             'local': conn['local_address'],
                             'remote': conn['remote_address'],
                             'protocol': conn['protocol'],
@@ -145,76 +238,68 @@ class TriageIRAnalyzer:
                     # Invalid IP address
                     pass
     
-    def _analyze_persistence(self):
+    def _analyze_persistence(self, mechanisms):
         """Analyze persistence mechanisms for unusual entries."""
-        mechanisms = self.results['artifacts']['persistence_mechanisms']
         self.stats['total_persistence'] = len(mechanisms)
-        
-        # Known good persistence sources
-        known_good = [
-            'Microsoft',
-            'Windows',
-            'Intel',
-            'NVIDIA',
-            'AMD',
-            'Realtek'
-        ]
+        add_indicator = self.indicators['unusual_persistence'].append
         
         for mech in mechanisms:
             source = mech.get('source', '')
             command = mech.get('command', '')
             
             # Check if persistence mechanism is from unknown vendor
-            if not any(vendor.lower() in source.lower() or vendor.lower() in command.lower() 
-                      for vendor in known_good):
-                self.indicators['unusual_persistence'].append({
+            if not (_KNOWN_GOOD_RE.search(source) or _KNOWN_GOOD_RE.search(command)):
+                add_indicator({
                     'type': mech['type'],
                     'name': mech['name'],
                     'command': command,
                     'source': source
                 })
     
-    def _analyze_events(self):
+    def _analyze_events(self, event_logs):
         """Analyze event logs for security indicators."""
-        event_logs = self.results['artifacts']['event_logs']
-        
         # Count total events
-        total_events = 0
-        for log_type in event_logs:
-            total_events += len(event_logs[log_type])
-        self.stats['total_events'] = total_events
+        self.stats['total_events'] = sum(map(len, event_logs.values()))
         
         # Analyze security events
         security_events = event_logs.get('security', [])
         
+        # Count failed logon attempts and privilege usage in one pass
+        failed_logons = 0
+        privilege_events = 0
+        for event in security_events:
+            event_id = event['event_id']
+            if event_id == _FAILED_LOGON_EVENT_ID:
+                failed_logons += 1
+            elif event_id in _PRIVILEGE_EVENT_IDS:
+                privilege_events += 1
+        
         # Look for failed logon attempts
-        failed_logons = [e for e in security_events if e['event_id'] == 4625]
-        if len(failed_logons) > 10:
+        if failed_logons > 10:
             self.indicators['security_events'].append({
                 'type': 'Multiple failed logons',
-                'count': len(failed_logons),
-                'details': f"{len(failed_logons)} failed logon attempts detected"
+                'count': failed_logons,
+                'details': f"{failed_logons} failed logon attempts detected"
             })
         
         # Look for privilege escalation
-        privilege_events = [e for e in security_events if e['event_id'] in [4672, 4673, 4674]]
         if privilege_events:
             self.indicators['security_events'].append({
                 'type': 'Privilege usage',
-                'count': len(privilege_events),
-                'details': f"{len(privilege_events)} privilege usage events"
+                'count': privilege_events,
+                'details': f"{privilege_events} privilege usage events"
             })
     
-    def _analyze_execution_evidence(self):
+    def _analyze_execution_evidence(self, execution):
         """Analyze execution evidence for anomalies."""
-        execution = self.results['artifacts'].get('execution_evidence', {})
+        add_indicator = self.indicators['execution_anomalies'].append
         
         # Analyze prefetch files
         prefetch_files = execution.get('prefetch_files', [])
         for pf in prefetch_files:
             # Check for executables with very high run counts
             if pf['run_count'] > 1000:
-                self.indicators['execution_anomalies'].append({
+                add_indicator({
                     'type': 'High execution count',
                     'executable': pf['executable_name'],
                     'count': pf['run_count'],
@@ -224,36 +309,42 @@ class TriageIRAnalyzer:
         # Analyze shimcache entries
         shimcache = execution.get('shimcache_entries', [])
         for entry in shimcache:
-            path = entry['path'].lower()
+            path = entry['path']
             # Check for executables in unusual locations
-            if ('temp' in path or 'downloads' in path) and entry.get('executed'):
-                self.indicators['execution_anomalies'].append({
+            if _TEMP_DOWNLOADS_RE.search(path) and entry.get('executed'):
+                add_indicator({
                     'type': 'Execution from temp/downloads',
-                    'path': entry['path'],
+                    'path': path,
                     'last_modified': entry['last_modified']
                 })
     
     def _analyze_collection_log(self):
         """Analyze collection log for errors and warnings."""
-        log_entries = self.results['collection_log']
-        
-        errors = [e for e in log_entries if e['level'] == 'ERROR']
-        warnings = [e for e in log_entries if e['level'] == 'WARN']
-        
-        for error in errors:
-            self.indicators['errors'].append({
-                'type': 'collection_error',
-                'message': error['message'],
-                'module': error.get('module', 'unknown'),
-                'timestamp': error['timestamp']
-            })
+        add_indicator = self.indicators['errors'].append
+        
+        # Report errors as they are found; only count warnings, keeping a few samples
+        warning_count = 0
+        warning_samples = []
+        for entry in self.results['collection_log']:
+            level = entry['level']
+            if level == 'ERROR':
+                add_indicator({
+                    'type': 'collection_error',
+                    'message': entry['message'],
+                    'module': entry.get('module', 'unknown'),
+                    'timestamp': entry['timestamp']
+                })
+            elif level == 'WARN':
+                warning_count += 1
+                if len(warning_samples) < 5:
+                    warning_samples.append(entry['message'])
         
         # Report if there were many warnings
-        if len(warnings) > 5:
-            self.indicators['errors'].append({
+        if warning_count > 5:
+            add_indicator({
                 'type': 'collection_warnings',
-                'message': f"{len(warnings)} warnings during collection",
-                'details': [w['message'] for w in warnings[:5]]  # First 5 warnings
+                'message': f"{warning_count} warnings during collection",
+                'details': warning_samples  # First 5 warnings
             })
     
     def generate_report(self, format_type='text'):
@@ -293,14 +384,14 @@ class TriageIRAnalyzer:
         report.append("")
         
         # Indicators
-        total_indicators = sum(len(indicators) for indicators in self.indicators.values())
+        total_indicators = self.total_indicators
         report.append(f"Security Indicators Found: {total_indicators}")
         report.append("")
         
         # Suspicious processes
         if self.indicators['suspicious_processes']:
             report.append("Suspicious Processes:")
-            for proc in self.indicators['suspicious_processes'][:10]:  # Top 10
+            for proc in self.indicators['suspicious_processes'].head[:10]:  # Top 10
                 report.append(f"  PID {proc['pid']}: {proc['name']} - {proc['reason']}")
                 if proc['path']:
                     report.append(f"    Path: {proc['path']}")
@@ -311,7 +402,7 @@ class TriageIRAnalyzer:
         # External connections
         if self.indicators['external_connections']:
             report.append("External Network Connections:")
-            for conn in self.indicators['external_connections'][:10]:  # Top 10
+            for conn in self.indicators['external_connections'].head[:10]:  # Top 10
                 report.append(f"  {conn['protocol']} {conn['local']} -> {conn['remote']} (PID {conn['pid']})")
             if len(self.indicators['external_connections']) > 10:
                 report.append(f"  ... and {len(self.indicators['external_connections']) - 10} more")
@@ -320,7 +411,7 @@ class TriageIRAnalyzer:
         # Unusual persistence
         if self.indicators['unusual_persistence']:
             report.append("Unusual Persistence Mechanisms:")
-            for pers in self.indicators['unusual_persistence'][:10]:  # Top 10
+            for pers in self.indicators['unusual_persistence'].head[:10]:  # Top 10
                 report.append(f"  {pers['type']}: {pers['name']}")
                 report.append(f"    Command: {pers['command']}")
             if len(self.indicators['unusual_persistence']) > 10:
@@ -379,9 +470,9 @@ class TriageIRAnalyzer:
         report_data = {
             'metadata': self.results['scan_metadata'],
             'statistics': self.stats,
-            'indicators': self.indicators,
+            'indicators': {name: bucket.head for name, bucket in self.indicators.items()},
             'summary': {
-                'total_indicators': sum(len(indicators) for indicators in self.indicators.values()),
+                'total_indicators': self.total_indicators,
                 'risk_level': self._calculate_risk_level(),
                 'generated_at': datetime.datetime.utcnow().isoformat() + 'Z'
             }
@@ -390,32 +481,13 @@ class TriageIRAnalyzer:
     
     def _generate_html_report(self):
         """Generate HTML format report."""
-        total_indicators = sum(len(indicators) for indicators in self.indicators.values())
+        total_indicators = self.total_indicators
         risk_level = self._calculate_risk_level()
         
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>TriageIR Analysis Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        .header {{ background-color: #f0f0f0; padding: 20px; border-radius: 5px; }}
-        .section {{ margin: 20px 0; }}
-        .indicator {{ background-color: #fff3cd; padding: 10px; margin: 5px 0; border-radius: 3px; }}
-        .risk-low {{ color: green; }}
-        .risk-medium {{ color: orange; }}
-        .risk-high {{ color: red; }}
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>TriageIR Analysis Report</h1>
-        <p><strong>Hostname:</strong> {self.results['scan_metadata']['hostname']}</p>
-        <p><strong>Scan Time:</strong> {self.results['scan_metadata']['scan_start_utc']}</p>
+        metadata = self.results['scan_metadata']
+        parts = [_HTML_REPORT_HEAD, f"""
+        <p><strong>Hostname:</strong> {_escape_html(metadata['hostname'])}</p>
+        <p><strong>Scan Time:</strong> {_escape_html(metadata['scan_start_utc'])}</p>
         <p><strong>Risk Level:</strong> <span class="risk-{risk_level.lower()}">{risk_level}</span></p>
     </div>
     
@@ -430,49 +502,48 @@ class TriageIRAnalyzer:
             <tr><td>Security Indicators</td><td>{total_indicators}</td></tr>
         </table>
     </div>
-"""
+"""]
         
         # Add indicators sections
         for indicator_type, indicators in self.indicators.items():
             if indicators:
-                html += f"""
+                parts.append(f"""
     <div class="section">
         <h2>{indicator_type.replace('_', ' ').title()}</h2>
-"""
-                for indicator in indicators[:10]:  # Limit to 10 per section
-                    html += f'        <div class="indicator">{self._format_indicator_html(indicator)}</div>\n'
+""")
+                for indicator in indicators.head[:10]:  # Limit to 10 per section
+                    parts.append(f'        <div class="indicator">{self._format_indicator_html(indicator)}</div>\n')
                 
                 if len(indicators) > 10:
-                    html += f'        <p><em>... and {len(indicators) - 10} more</em></p>\n'
+                    parts.append(f'        <p><em>... and {len(indicators) - 10} more</em></p>\n')
                 
-                html += "    </div>\n"
+                parts.append("    </div>\n")
         
-        html += """
+        parts.append("""
 </body>
 </html>
-"""
-        return html
+""")
+        return ''.join(parts)
     
     def _format_indicator_html(self, indicator):
-        """Format an indicator for HTML display."""
-        if 'pid' in indicator:
-            return f"PID {indicator['pid']}: {indicator['name']} - {indicator['reason']}"
+        """Format an indicator for HTML display, escaping its contents."""
+        if 'remote' in indicator:
+            text = f"{indicator['protocol']} {indicator['local']} -> {indicator['remote']} (PID {indicator['pid']})"
+        elif 'pid' in indicator:
+            text = f"PID {indicator['pid']}: {indicator['name']} - {indicator['reason']}"
         elif 'type' in indicator and 'details' in indicator:
-            return f"{indicator['type']}: {indicator['details']}"
+            text = f"{indicator['type']}: {indicator['details']}"
         elif 'message' in indicator:
-            return indicator['message']
+            text = indicator['message']
         else:
-            return str(indicator)
+            text = str(indicator)
+        return _escape_html(text)
     
     def _calculate_risk_level(self):
         """Calculate overall risk level based on indicators."""
-        total_indicators = sum(len(indicators) for indicators in self.indicators.values())
-        
-        if total_indicators == 0:
-            return "LOW"
-        elif total_indicators < 5:
+        if self.total_indicators < 5:
             return "LOW"
-        elif total_indicators < 15:
+        elif self.total_indicators < 15:
             return "MEDIUM"
         else:
             return "HIGH"
@@ -491,7 +562,9 @@ def main():
         sys.exit(1)
     
     try:
-        analyzer = TriageIRAnalyzer(args.results_file)
+        # Only the JSON report lists every indicator
+        indicator_limit = None if args.format == 'json' else 10
+        analyzer = TriageIRAnalyzer(args.results_file, indicator_limit)
         analyzer.analyze()
         report = analyzer.generate_report(args.format)
         
@@ -4,322 +4,440 @@ TriageIR Report Generator
 Generates comprehensive HTML reports from TriageIR JSON output
 """
 
-import json
+import os
+import re
 import sys
 import argparse
+import tempfile
 from datetime import datetime
+from html import escape
 from pathlib import Path
 import base64
+from collections import Counter
+
+from _jsonio import JSON_ERRORS, load_json, should_stream, stream_json
+
+# Loopback and RFC 1918 private address prefixes
+_PRIVATE_IP_RE = re.compile(r'127\.|192\.168\.|10\.|172\.(?:1[6-9]|2[0-9]|3[01])\.')
+
+# Keywords that flag a process path or persistence command as suspicious
+_SUS_PATH_RE = re.compile(r'temp|appdata|downloads|users', re.IGNORECASE)
+_SUS_CMD_RE = re.compile(r'temp|appdata|downloads|powershell|cmd', re.IGNORECASE)
+
+# Characters not allowed in the element id built from a persistence type; the id
+# is also embedded in a JavaScript string in the section's onclick handler
+_NON_ID_CHAR_RE = re.compile(r'\W')
+
+# Most rows kept for each report table; the analyzers still count every match
+_ROW_LIMITS = {
+    'unsigned_processes': 20,
+    'suspicious_locations': 20,
+    'external_connections': 50,
+    'persistence_per_type': 20
+}
+
+# Top-level sections every TriageIR result file must contain
+_REQUIRED_KEYS = ('scan_metadata', 'artifacts', 'collection_log')
 
 def load_triageir_results(json_file):
-    """Load and validate TriageIR JSON results"""
+    """Load and validate TriageIR JSON results
+    
+    For scans big enough to stream, with ijson installed, the artifact arrays
+    and collection log are not loaded into memory; they are streamed from the
+    file each time they are iterated.
+    """
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
+        if should_stream(json_file):
+            data = stream_json(json_file)
+        else:
+            data = load_json(json_file)
         
         # Basic validation
-        required_keys = ['scan_metadata', 'artifacts', 'collection_log']
-        for key in required_keys:
+        for key in _REQUIRED_KEYS:
             if key not in data:
                 raise ValueError(f"Missing required key: {key}")
         
         return data
-    except json.JSONDecodeError as e:
+    except JSON_ERRORS as e:
         raise ValueError(f"Invalid JSON format: {e}")
     except FileNotFoundError:
         raise ValueError(f"File not found: {json_file}")
 
+def _truncate(value, limit=100):
+    """Cut a long value down for display, marking the cut with an ellipsis"""
+    return value[:limit] + '...' if len(value) > limit else value
+
+def _process_row(process, path):
+    """Escape the process fields shown in the report once, as the row is collected"""
+    return {
+        'pid': escape(str(process.get('pid', 'N/A'))),
+        'name': escape(process.get('name', 'N/A')),
+        'path': escape(path),
+        'command_line': escape(_truncate(process.get('command_line', 'N/A')))
+    }
+
+def _connection_row(conn):
+    """Escape the connection fields shown in the report"""
+    return {
+        'protocol': escape(str(conn.get('protocol', 'N/A'))),
+        'local_address': escape(conn.get('local_address', 'N/A')),
+        'remote_address': escape(conn.get('remote_address', 'N/A')),
+        'state': escape(str(conn.get('state', 'N/A'))),
+        'owning_pid': escape(str(conn.get('owning_pid', 'N/A')))
+    }
+
+def _persistence_row(mech, command, is_suspicious):
+    """Escape the persistence fields shown in the report"""
+    return {
+        'name': escape(mech.get('name', 'N/A')),
+        'command': escape(_truncate(command)),
+        'source': escape(mech.get('source', 'N/A')),
+        'suspicious': is_suspicious
+    }
+
 def analyze_processes(processes):
     """Analyze process data for suspicious indicators"""
     analysis = {
-        'total_processes': len(processes),
+        'total_processes': 0,
+        'unsigned_total': 0,
         'unsigned_processes': [],
-        'suspicious_locations': [],
-        'high_memory_processes': [],
-        'recent_processes': []
+        'suspicious_locations': []
     }
+    suspicious_locations = analysis['suspicious_locations']
+    add_unsigned = analysis['unsigned_processes'].append
+    add_suspicious = suspicious_locations.append
+    
+    unsigned_limit = _ROW_LIMITS['unsigned_processes']
+    suspicious_limit = _ROW_LIMITS['suspicious_locations']
     
+    total = 0
+    unsigned_total = 0
     for process in processes:
+        total += 1
+        path = process.get('executable_path', 'N/A')
+        row = None
+        
         # Check for unsigned processes
         if not process.get('sha256_hash'):
-            analysis['unsigned_processes'].append(process)
+            unsigned_total += 1
+            if unsigned_total <= unsigned_limit:
+                row = _process_row(process, path)
+                add_unsigned(row)
         
         # Check for suspicious locations
-        path = process.get('executable_path', '').lower()
-        if any(loc in path for loc in ['temp', 'appdata', 'downloads', 'users']):
-            analysis['suspicious_locations'].append(process)
-        
-        # Check for high memory usage (>100MB)
-        if process.get('memory_usage', 0) > 100 * 1024 * 1024:
-            analysis['high_memory_processes'].append(process)
-        
-        # Check for recently started processes (within last hour)
-        try:
-            start_time = datetime.fromisoformat(process['start_time'].replace('Z', '+00:00'))
-            scan_time = datetime.now().replace(tzinfo=start_time.tzinfo)
-            if (scan_time - start_time).total_seconds() < 3600:
-                analysis['recent_processes'].append(process)
-        except (ValueError, KeyError):
-            pass
+        if len(suspicious_locations) < suspicious_limit and _SUS_PATH_RE.search(path):
+            add_suspicious(row if row is not None else _process_row(process, path))
     
+    analysis['total_processes'] = total
+    analysis['unsigned_total'] = unsigned_total
     return analysis
 
 def analyze_network_connections(connections):
     """Analyze network connections for anomalies"""
     analysis = {
-        'total_connections': len(connections),
-        'external_connections': [],
-        'listening_ports': [],
-        'established_connections': []
+        'total_connections': 0,
+        'external_total': 0,
+        'external_connections': []
     }
+    add_external = analysis['external_connections'].append
     
-    private_ranges = [
-        '127.', '192.168.', '10.',
-        '172.16.', '172.17.', '172.18.', '172.19.',
-        '172.20.', '172.21.', '172.22.', '172.23.',
-        '172.24.', '172.25.', '172.26.', '172.27.',
-        '172.28.', '172.29.', '172.30.', '172.31.'
-    ]
+    external_limit = _ROW_LIMITS['external_connections']
     
+    total = 0
+    external_total = 0
     for conn in connections:
+        total += 1
         remote_ip = conn['remote_address'].split(':')[0]
         
         # Check for external connections
-        if not any(remote_ip.startswith(prefix) for prefix in private_ranges):
-            analysis['external_connections'].append(conn)
-        
-        # Check for listening ports
-        if conn['state'] == 'LISTENING':
-            analysis['listening_ports'].append(conn)
-        
-        # Check for established connections
-        if conn['state'] == 'ESTABLISHED':
-            analysis['established_connections'].append(conn)
+        if not _PRIVATE_IP_RE.match(remote_ip):
+            external_total += 1
+            if external_total <= external_limit:
+                add_external(_connection_row(conn))
     
+    analysis['total_connections'] = total
+    analysis['external_total'] = external_total
     return analysis
 
 def analyze_persistence_mechanisms(persistence):
     """Analyze persistence mechanisms"""
     analysis = {
-        'total_mechanisms': len(persistence),
+        'total_mechanisms': 0,
         'by_type': {},
-        'suspicious_mechanisms': []
+        'type_totals': {}
     }
+    by_type = analysis['by_type']
+    type_totals = analysis['type_totals']
+    per_type_limit = _ROW_LIMITS['persistence_per_type']
     
+    total = 0
     for mech in persistence:
-        mech_type = mech.get('type', 'Unknown')
-        if mech_type not in analysis['by_type']:
-            analysis['by_type'][mech_type] = []
-        analysis['by_type'][mech_type].append(mech)
+        total += 1
         
         # Check for suspicious characteristics
-        command = mech.get('command', '').lower()
-        if any(sus in command for sus in ['temp', 'appdata', 'downloads', 'powershell', 'cmd']):
-            analysis['suspicious_mechanisms'].append(mech)
+        command = mech.get('command', 'N/A')
+        is_suspicious = _SUS_CMD_RE.search(command) is not None
+        
+        mech_type = mech.get('type', 'Unknown')
+        if mech_type not in by_type:
+            by_type[mech_type] = []
+            type_totals[mech_type] = 0
+        type_totals[mech_type] += 1
+        rows = by_type[mech_type]
+        if len(rows) < per_type_limit:
+            rows.append(_persistence_row(mech, command, is_suspicious))
     
+    analysis['total_mechanisms'] = total
     return analysis
 
-def generate_html_report(data, output_file):
-    """Generate comprehensive HTML report"""
-    
-    # Analyze data
-    process_analysis = analyze_processes(data['artifacts']['running_processes'])
-    network_analysis = analyze_network_connections(data['artifacts']['network_connections'])
-    persistence_analysis = analyze_persistence_mechanisms(data['artifacts']['persistence_mechanisms'])
-    
-    # Count errors and warnings in collection log
-    log_stats = {'ERROR': 0, 'WARN': 0, 'INFO': 0, 'DEBUG': 0}
-    for log_entry in data['collection_log']:
+def tally_collection_log(collection_log):
+    """Count log entries by level and collect the errors and warnings"""
+    log_stats = Counter()
+    log_issues = []
+    for log_entry in collection_log:
         level = log_entry.get('level', 'INFO')
-        log_stats[level] = log_stats.get(level, 0) + 1
+        log_stats[level] += 1
+        if level in ('ERROR', 'WARN'):
+            log_issues.append(log_entry)
     
-    # Generate HTML
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>TriageIR Report - {data['scan_metadata']['hostname']}</title>
-    <style>
-        body {{
+    return log_stats, log_issues
+
+# Static stylesheet and script for the report head, encoded once at import
+_CSS_STYLE = """    <style>
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
             color: #333;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             padding: 30px;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             border-bottom: 3px solid #2c3e50;
             padding-bottom: 20px;
             margin-bottom: 30px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #2c3e50;
             margin: 0;
             font-size: 2.5em;
-        }}
-        .header .subtitle {{
+        }
+        .header .subtitle {
             color: #7f8c8d;
             font-size: 1.2em;
             margin-top: 10px;
-        }}
-        .summary-grid {{
+        }
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
-        .summary-card {{
+        }
+        .summary-card {
             background: #ecf0f1;
             padding: 20px;
             border-radius: 6px;
             border-left: 4px solid #3498db;
-        }}
-        .summary-card.warning {{
+        }
+        .summary-card.warning {
             border-left-color: #f39c12;
-        }}
-        .summary-card.danger {{
+        }
+        .summary-card.danger {
             border-left-color: #e74c3c;
-        }}
-        .summary-card h3 {{
+        }
+        .summary-card h3 {
             margin: 0 0 10px 0;
             color: #2c3e50;
-        }}
-        .summary-card .value {{
+        }
+        .summary-card .value {
             font-size: 2em;
             font-weight: bold;
             color: #2c3e50;
-        }}
-        .section {{
+        }
+        .section {
             margin-bottom: 40px;
-        }}
-        .section h2 {{
+        }
+        .section h2 {
             color: #2c3e50;
             border-bottom: 2px solid #ecf0f1;
             padding-bottom: 10px;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 15px;
-        }}
-        th, td {{
+        }
+        th, td {
             padding: 12px;
             text-align: left;
             border-bottom: 1px solid #ddd;
-        }}
-        th {{
+        }
+        th {
             background-color: #34495e;
             color: white;
             font-weight: 600;
-        }}
-        tr:hover {{
+        }
+        tr:hover {
             background-color: #f8f9fa;
-        }}
-        .highlight {{
+        }
+        .highlight {
             background-color: #fff3cd;
             padding: 2px 4px;
             border-radius: 3px;
-        }}
-        .danger-highlight {{
+        }
+        .danger-highlight {
             background-color: #f8d7da;
             padding: 2px 4px;
             border-radius: 3px;
-        }}
-        .metadata {{
+        }
+        .metadata {
             background: #f8f9fa;
             padding: 15px;
             border-radius: 6px;
             margin-bottom: 20px;
-        }}
-        .metadata table {{
+        }
+        .metadata table {
             margin: 0;
-        }}
-        .metadata th, .metadata td {{
+        }
+        .metadata th, .metadata td {
             border: none;
             padding: 8px 12px;
-        }}
-        .log-entry {{
+        }
+        .log-entry {
             padding: 8px 12px;
             margin: 5px 0;
             border-radius: 4px;
             font-family: monospace;
             font-size: 0.9em;
-        }}
-        .log-error {{
+        }
+        .log-error {
             background-color: #f8d7da;
             border-left: 4px solid #dc3545;
-        }}
-        .log-warn {{
+        }
+        .log-warn {
             background-color: #fff3cd;
             border-left: 4px solid #ffc107;
-        }}
-        .log-info {{
+        }
+        .log-info {
             background-color: #d1ecf1;
             border-left: 4px solid #17a2b8;
-        }}
-        .expandable {{
+        }
+        .expandable {
             cursor: pointer;
             user-select: none;
-        }}
-        .expandable:hover {{
+        }
+        .expandable:hover {
             background-color: #e9ecef;
-        }}
-        .collapsed {{
+        }
+        .collapsed {
             display: none;
-        }}
+        }
     </style>
-    <script>
-        function toggleSection(id) {{
+""".encode()
+
+_JS_BLOCK = """    <script>
+        function toggleSection(id) {
             const element = document.getElementById(id);
             element.classList.toggle('collapsed');
-        }}
+        }
     </script>
-</head>
+""".encode()
+
+# Row templates, filled from the pre-escaped rows the analyzers collect
+_UNSIGNED_PROCESS_ROW = """
+                <tr>
+                    <td>{pid}</td>
+                    <td class="danger-highlight">{name}</td>
+                    <td>{path}</td>
+                    <td>{command_line}</td>
+                </tr>
+"""
+
+_SUSPICIOUS_LOCATION_ROW = """
+                <tr>
+                    <td>{pid}</td>
+                    <td>{name}</td>
+                    <td class="highlight">{path}</td>
+                </tr>
+"""
+
+_EXTERNAL_CONNECTION_ROW = """
+            <tr>
+                <td>{protocol}</td>
+                <td>{local_address}</td>
+                <td class="highlight">{remote_address}</td>
+                <td>{state}</td>
+                <td>{owning_pid}</td>
+            </tr>
+"""
+
+_PERSISTENCE_ROW = """
+                <tr>
+                    <td class="{highlight_class}">{name}</td>
+                    <td>{command}</td>
+                    <td>{source}</td>
+                </tr>
+"""
+
+def _write_header(f, data):
+    """Write the document head, title banner and scan metadata"""
+    f.write(f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>TriageIR Report - {escape(data['scan_metadata']['hostname'])}</title>
+""".encode())
+    f.write(_CSS_STYLE)
+    f.write(_JS_BLOCK)
+    f.write(f"""</head>
 <body>
     <div class="container">
         <div class="header">
             <h1>TriageIR Forensic Report</h1>
-            <div class="subtitle">System: {data['scan_metadata']['hostname']} | Scan ID: {data['scan_metadata']['scan_id']}</div>
+            <div class="subtitle">System: {escape(data['scan_metadata']['hostname'])} | Scan ID: {escape(data['scan_metadata']['scan_id'])}</div>
         </div>
 
         <div class="metadata">
             <h3>Scan Information</h3>
             <table>
-                <tr><th>Hostname</th><td>{data['scan_metadata']['hostname']}</td></tr>
-                <tr><th>OS Version</th><td>{data['scan_metadata']['os_version']}</td></tr>
-                <tr><th>Scan Start</th><td>{data['scan_metadata']['scan_start_utc']}</td></tr>
-                <tr><th>Duration</th><td>{data['scan_metadata']['scan_duration_ms']} ms</td></tr>
-                <tr><th>CLI Version</th><td>{data['scan_metadata']['cli_version']}</td></tr>
-                <tr><th>System Uptime</th><td>{data['artifacts']['system_info']['uptime_secs']} seconds</td></tr>
+                <tr><th>Hostname</th><td>{escape(data['scan_metadata']['hostname'])}</td></tr>
+                <tr><th>OS Version</th><td>{escape(data['scan_metadata']['os_version'])}</td></tr>
+                <tr><th>Scan Start</th><td>{escape(data['scan_metadata']['scan_start_utc'])}</td></tr>
+                <tr><th>Duration</th><td>{escape(str(data['scan_metadata']['scan_duration_ms']))} ms</td></tr>
+                <tr><th>CLI Version</th><td>{escape(data['scan_metadata']['cli_version'])}</td></tr>
+                <tr><th>System Uptime</th><td>{escape(str(data['artifacts']['system_info']['uptime_secs']))} seconds</td></tr>
             </table>
         </div>
+""".encode())
 
+def _write_summary(f, process_analysis, network_analysis, persistence_analysis, log_stats):
+    """Write the summary cards"""
+    f.write(f"""
         <div class="summary-grid">
             <div class="summary-card">
                 <h3>Total Processes</h3>
                 <div class="value">{process_analysis['total_processes']}</div>
             </div>
-            <div class="summary-card {'warning' if len(process_analysis['unsigned_processes']) > 0 else ''}">
+            <div class="summary-card {'warning' if process_analysis['unsigned_total'] > 0 else ''}">
                 <h3>Unsigned Processes</h3>
-                <div class="value">{len(process_analysis['unsigned_processes'])}</div>
+                <div class="value">{process_analysis['unsigned_total']}</div>
             </div>
             <div class="summary-card">
                 <h3>Network Connections</h3>
                 <div class="value">{network_analysis['total_connections']}</div>
             </div>
-            <div class="summary-card {'warning' if len(network_analysis['external_connections']) > 0 else ''}">
+            <div class="summary-card {'warning' if network_analysis['external_total'] > 0 else ''}">
                 <h3>External Connections</h3>
-                <div class="value">{len(network_analysis['external_connections'])}</div>
+                <div class="value">{network_analysis['external_total']}</div>
             </div>
             <div class="summary-card">
                 <h3>Persistence Mechanisms</h3>
@@ -330,128 +448,106 @@ def generate_html_report(data, output_file):
                 <div class="value">{log_stats['ERROR'] + log_stats['WARN']}</div>
             </div>
         </div>
-"""
+""".encode())
 
-    # Suspicious Processes Section
+def _write_processes(f, process_analysis):
+    """Write the suspicious processes section"""
     if process_analysis['unsigned_processes'] or process_analysis['suspicious_locations']:
-        html_content += """
+        f.write("""
         <div class="section">
             <h2>⚠️ Suspicious Processes</h2>
-"""
+""".encode())
         
         if process_analysis['unsigned_processes']:
-            html_content += """
+            f.write("""
             <h3>Unsigned Processes</h3>
             <table>
                 <tr><th>PID</th><th>Name</th><th>Path</th><th>Command Line</th></tr>
-"""
-            for process in process_analysis['unsigned_processes'][:20]:  # Limit to 20
-                html_content += f"""
-                <tr>
-                    <td>{process['pid']}</td>
-                    <td class="danger-highlight">{process['name']}</td>
-                    <td>{process.get('executable_path', 'N/A')}</td>
-                    <td>{process.get('command_line', 'N/A')[:100]}{'...' if len(process.get('command_line', '')) > 100 else ''}</td>
-                </tr>
-"""
-            html_content += "</table>"
+""".encode())
+            f.write(''.join(map(_UNSIGNED_PROCESS_ROW.format_map,
+                                process_analysis['unsigned_processes'])).encode())
+            f.write(b"</table>")
         
         if process_analysis['suspicious_locations']:
-            html_content += """
+            f.write("""
             <h3>Processes in Suspicious Locations</h3>
             <table>
                 <tr><th>PID</th><th>Name</th><th>Path</th></tr>
-"""
-            for process in process_analysis['suspicious_locations'][:20]:
-                html_content += f"""
-                <tr>
-                    <td>{process['pid']}</td>
-                    <td>{process['name']}</td>
-                    <td class="highlight">{process.get('executable_path', 'N/A')}</td>
-                </tr>
-"""
-            html_content += "</table>"
+""".encode())
+            f.write(''.join(map(_SUSPICIOUS_LOCATION_ROW.format_map,
+                                process_analysis['suspicious_locations'])).encode())
+            f.write(b"</table>")
         
-        html_content += "</div>"
+        f.write(b"</div>")
 
-    # Network Connections Section
+def _write_network(f, network_analysis):
+    """Write the external network connections section"""
     if network_analysis['external_connections']:
-        html_content += """
+        f.write("""
         <div class="section">
             <h2>🌐 External Network Connections</h2>
             <table>
                 <tr><th>Protocol</th><th>Local Address</th><th>Remote Address</th><th>State</th><th>PID</th></tr>
-"""
-        for conn in network_analysis['external_connections'][:50]:  # Limit to 50
-            html_content += f"""
-            <tr>
-                <td>{conn['protocol']}</td>
-                <td>{conn['local_address']}</td>
-                <td class="highlight">{conn['remote_address']}</td>
-                <td>{conn['state']}</td>
-                <td>{conn['owning_pid']}</td>
-            </tr>
-"""
-        html_content += "</table></div>"
+""".encode())
+        f.write(''.join(map(_EXTERNAL_CONNECTION_ROW.format_map,
+                            network_analysis['external_connections'])).encode())
+        f.write(b"</table></div>")
 
-    # Persistence Mechanisms Section
+def _write_persistence(f, persistence_analysis):
+    """Write the persistence mechanisms section"""
     if persistence_analysis['total_mechanisms'] > 0:
-        html_content += """
+        f.write("""
         <div class="section">
             <h2>🔄 Persistence Mechanisms</h2>
-"""
+""".encode())
         for mech_type, mechanisms in persistence_analysis['by_type'].items():
-            html_content += f"""
-            <h3 class="expandable" onclick="toggleSection('{mech_type.replace(' ', '_')}_table')">{mech_type} ({len(mechanisms)})</h3>
-            <table id="{mech_type.replace(' ', '_')}_table">
+            table_id = _NON_ID_CHAR_RE.sub('_', mech_type)
+            f.write(f"""
+            <h3 class="expandable" onclick="toggleSection('{table_id}_table')">{escape(mech_type)} ({persistence_analysis['type_totals'][mech_type]})</h3>
+            <table id="{table_id}_table">
                 <tr><th>Name</th><th>Command</th><th>Source</th></tr>
-"""
-            for mech in mechanisms[:20]:  # Limit to 20 per type
-                is_suspicious = mech in persistence_analysis['suspicious_mechanisms']
-                highlight_class = 'danger-highlight' if is_suspicious else ''
-                html_content += f"""
-                <tr>
-                    <td class="{highlight_class}">{mech.get('name', 'N/A')}</td>
-                    <td>{mech.get('command', 'N/A')[:100]}{'...' if len(mech.get('command', '')) > 100 else ''}</td>
-                    <td>{mech.get('source', 'N/A')}</td>
-                </tr>
-"""
-            html_content += "</table>"
-        html_content += "</div>"
+""".encode())
+            f.write(''.join(
+                _PERSISTENCE_ROW.format(highlight_class='danger-highlight' if mech['suspicious'] else '', **mech)
+                for mech in mechanisms).encode())
+            f.write(b"</table>")
+        f.write(b"</div>")
 
-    # System Information Section
-    html_content += f"""
+def _write_system_info(f, data):
+    """Write the system information section"""
+    f.write(f"""
         <div class="section">
             <h2>💻 System Information</h2>
             <table>
                 <tr><th>Property</th><th>Value</th></tr>
-                <tr><td>Architecture</td><td>{data['artifacts']['system_info'].get('architecture', 'N/A')}</td></tr>
+                <tr><td>Architecture</td><td>{escape(data['artifacts']['system_info'].get('architecture', 'N/A'))}</td></tr>
                 <tr><td>Total Memory</td><td>{data['artifacts']['system_info'].get('total_memory', 0) // (1024**3)} GB</td></tr>
                 <tr><td>Available Memory</td><td>{data['artifacts']['system_info'].get('available_memory', 0) // (1024**3)} GB</td></tr>
                 <tr><td>Logged-on Users</td><td>{len(data['artifacts']['system_info'].get('logged_on_users', []))}</td></tr>
             </table>
         </div>
-"""
+""".encode())
 
-    # Collection Log Section (if there are errors or warnings)
-    if log_stats['ERROR'] > 0 or log_stats['WARN'] > 0:
-        html_content += """
+def _write_collection_log(f, log_issues):
+    """Write collection log errors and warnings"""
+    if log_issues:
+        f.write("""
         <div class="section">
             <h2>📋 Collection Issues</h2>
-"""
-        for log_entry in data['collection_log']:
-            level = log_entry.get('level', 'INFO')
-            if level in ['ERROR', 'WARN']:
-                css_class = f'log-{level.lower()}'
-                html_content += f"""
+""".encode())
+        for log_entry in log_issues:
+            level = log_entry['level']
+            css_class = f'log-{level.lower()}'
+            f.write(f"""
                 <div class="log-entry {css_class}">
-                    <strong>{level}</strong> [{log_entry.get('timestamp', 'N/A')}]: {log_entry.get('message', 'N/A')}
+                    <strong>{level}</strong> [{escape(log_entry.get('timestamp', 'N/A'))}]: {escape(log_entry.get('message', 'N/A'))}
                 </div>
-"""
-        html_content += "</div>"
+""".encode())
+        f.write(b"</div>")
 
-    # Footer
-    html_content += f"""
+def _write_footer(f):
+    """Write the report footer"""
+    f.write(f"""
         <div class="section">
             <hr>
             <p><em>Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} by TriageIR Report Generator</em></p>
@@ -459,11 +555,62 @@ def generate_html_report(data, output_file):
     </div>
 </body>
 </html>
-"""
+""".encode())
+
+def _write_report(f, data, process_analysis, network_analysis, persistence_analysis, log_stats, log_issues):
+    """Write every section of the report"""
+    _write_header(f, data)
+    _write_summary(f, process_analysis, network_analysis, persistence_analysis, log_stats)
+    _write_processes(f, process_analysis)
+    _write_network(f, network_analysis)
+    _write_persistence(f, persistence_analysis)
+    _write_system_info(f, data)
+    _write_collection_log(f, log_issues)
+    _write_footer(f)
 
+def _new_file_mode():
+    """Return the permissions open() gives a new file under the current umask
+    
+    Temporary files are created owner-only; the finished report gets the
+    usual permissions instead.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def generate_html_report(data, output_file):
+    """Generate comprehensive HTML report"""
+    
+    # Analyze data
+    process_analysis = analyze_processes(data['artifacts']['running_processes'])
+    network_analysis = analyze_network_connections(data['artifacts']['network_connections'])
+    persistence_analysis = analyze_persistence_mechanisms(data['artifacts']['persistence_mechanisms'])
+    log_stats, log_issues = tally_collection_log(data['collection_log'])
+    
     # Write HTML file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # UTF-8 is encoded by the writers; the binary file skips the text layer.
+    # Devices and pipes such as /dev/stdout are written to directly
+    if os.path.exists(output_file) and not os.path.isfile(output_file):
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            _write_report(f, data, process_analysis, network_analysis, persistence_analysis,
+                          log_stats, log_issues)
+        return
+    
+    # A regular file is written next to its destination and moved into place
+    # only once complete, so bad input that makes a writer fail leaves no
+    # truncated report behind
+    temp = tempfile.NamedTemporaryFile('wb', buffering=1 << 20, delete=False, suffix='.tmp',
+                                       dir=os.path.dirname(os.path.abspath(output_file)))
+    try:
+        with temp as f:
+            _write_report(f, data, process_analysis, network_analysis, persistence_analysis,
+                          log_stats, log_issues)
+        os.chmod(temp.name, _new_file_mode())
+        os.replace(temp.name, output_file)
+    except BaseException:
+        if os.path.exists(temp.name):
+            os.remove(temp.name)
+        raise
 
 def main():
     parser = argparse.ArgumentParser(description='Generate HTML report from TriageIR JSON output')
@@ -4,56 +4,140 @@ TriageIR JSON Validator
 Validates TriageIR JSON output against schema and performs integrity checks
 """
 
-import json
+import os
 import sys
 import argparse
 from datetime import datetime
 import re
+import socket
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from _jsonio import JSON_ERRORS, StreamedArray, load_json, should_stream, stream_json
+
+_UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+# Every string fromisoformat() accepts opens with a year followed by a month
+# or ISO week; anything else is rejected without raising ValueError.
+_TS_PREFIX_RE = re.compile(r'\d{4}-?(?:\d{2}|W\d)', re.ASCII)
+
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat  # accepts a trailing 'Z' natively
+else:
+    def _fromisoformat(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _valid_ts(value):
+    """Check that a value parses as an ISO-8601 timestamp"""
+    if not _TS_PREFIX_RE.match(value):
+        return False
+    try:
+        _fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+def _is_private_ip(address):
+    """Check an IPv4 address against the loopback and RFC 1918 networks with integer masks"""
+    try:
+        packed = int.from_bytes(socket.inet_aton(address), 'big')
+    except (OSError, ValueError):  # ValueError for strings with an embedded NUL
+        return False
+    return (packed & 0xFF000000 in (0x7F000000, 0x0A000000)  # 127.0.0.0/8, 10.0.0.0/8
+            or packed & 0xFFFF0000 == 0xC0A80000             # 192.168.0.0/16
+            or packed & 0xFFF00000 == 0xAC100000)            # 172.16.0.0/12
+
+# Keywords that flag a process path or persistence command as suspicious
+_SUSPICIOUS_PATH_RE = re.compile('|'.join(map(re.escape, ('temp', 'appdata\\local\\temp', 'downloads'))),
+                                 re.IGNORECASE)
+_SUSPICIOUS_COMMAND_RE = re.compile('|'.join(map(re.escape, ('powershell', 'cmd', 'temp', 'appdata'))),
+                                    re.IGNORECASE)
+
+def _is_sha256(value):
+    """Check for a 64-character hex digest without going through the regex engine"""
+    return len(value) == 64 and _HEX_DIGITS.issuperset(value)
+
+# Required fields of each part of the schema, in the order they are reported
+_REQUIRED_TOP_LEVEL = ('scan_metadata', 'artifacts', 'collection_log')
+_REQUIRED_METADATA = ('scan_id', 'scan_start_utc', 'scan_duration_ms', 'hostname', 'os_version', 'cli_version')
+_REQUIRED_ARTIFACTS = ('system_info', 'running_processes', 'network_connections',
+                       'persistence_mechanisms', 'event_logs', 'execution_evidence')
+_REQUIRED_EVENT_LOGS = ('security', 'system', 'application')
+_PROCESS_FIELDS = ('pid', 'parent_pid', 'name', 'command_line', 'executable_path', 'start_time')
+_CONNECTION_FIELDS = ('protocol', 'local_address', 'remote_address', 'state', 'owning_pid')
+_PERSISTENCE_FIELDS = ('type', 'name', 'command', 'source')
+_EVENT_FIELDS = ('event_id', 'level', 'timestamp', 'source', 'message')
+_PREFETCH_FIELDS = ('filename', 'executable_name', 'run_count', 'last_run_time', 'file_paths')
+_SHIMCACHE_FIELDS = ('path', 'last_modified', 'file_size')
+_LOG_ENTRY_FIELDS = ('timestamp', 'level', 'message')
+
+# Allowed values of the enumerated fields. Values are checked to be strings before
+# the lookup, since a list or dict in their place is unhashable.
+_VALID_PROTOCOLS = frozenset({'TCP', 'UDP'})
+_VALID_STATES = frozenset({'LISTENING', 'ESTABLISHED', 'TIME_WAIT', 'CLOSE_WAIT',
+                           'FIN_WAIT1', 'FIN_WAIT2', 'SYN_SENT', 'SYN_RECV', 'LAST_ACK', 'CLOSED'})
+_VALID_PERSISTENCE_TYPES = frozenset({'Registry Run Key', 'Scheduled Task', 'Service',
+                                      'Startup Folder', 'WMI Event', 'DLL Hijacking'})
+_VALID_EVENT_LEVELS = frozenset({'Critical', 'Error', 'Warning', 'Information', 'Verbose'})
+_VALID_LOG_LEVELS = frozenset({'ERROR', 'WARN', 'INFO', 'DEBUG'})
+
+# Types the validators accept where the schema expects a JSON array
+_ARRAY_TYPES = (list, StreamedArray)
+
+def _load_json(path):
+    """Load a scan, streaming its large arrays when it is big enough and ijson is available
+    
+    Otherwise the whole file is parsed, with orjson when it is installed.
+    """
+    if should_stream(path):
+        return stream_json(path)
+    return load_json(path)
+
+def _format_finding(finding):
+    """Render a finding recorded by the validators
+    
+    Validators record each error or warning as a (template, *values) tuple, so
+    the message text is only built for findings that are actually printed.
+    """
+    return finding[0].format(*finding[1:])
 
 def validate_json_structure(data):
     """Validate basic JSON structure"""
     errors = []
     warnings = []
+    add_error = errors.append
     
     # Check required top-level keys
-    required_keys = ['scan_metadata', 'artifacts', 'collection_log']
-    for key in required_keys:
+    for key in _REQUIRED_TOP_LEVEL:
         if key not in data:
-            errors.append(f"Missing required top-level key: {key}")
+            add_error(("Missing required top-level key: {}", key))
     
     if 'scan_metadata' in data:
         metadata = data['scan_metadata']
-        required_metadata = ['scan_id', 'scan_start_utc', 'scan_duration_ms', 'hostname', 'os_version', 'cli_version']
-        for key in required_metadata:
+        for key in _REQUIRED_METADATA:
             if key not in metadata:
-                errors.append(f"Missing required metadata key: {key}")
+                add_error(("Missing required metadata key: {}", key))
         
         # Validate UUID format
         if 'scan_id' in metadata:
-            uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-            if not re.match(uuid_pattern, metadata['scan_id'], re.IGNORECASE):
-                errors.append(f"Invalid UUID format for scan_id: {metadata['scan_id']}")
+            if not _UUID_RE.match(metadata['scan_id']):
+                add_error(("Invalid UUID format for scan_id: {}", metadata['scan_id']))
         
         # Validate timestamp format
         if 'scan_start_utc' in metadata:
-            try:
-                datetime.fromisoformat(metadata['scan_start_utc'].replace('Z', '+00:00'))
-            except ValueError:
-                errors.append(f"Invalid timestamp format for scan_start_utc: {metadata['scan_start_utc']}")
+            if not _valid_ts(metadata['scan_start_utc']):
+                add_error(("Invalid timestamp format for scan_start_utc: {}", metadata['scan_start_utc']))
         
         # Validate duration
         if 'scan_duration_ms' in metadata:
-            if not isinstance(metadata['scan_duration_ms'], int) or metadata['scan_duration_ms'] < 0:
-                errors.append(f"Invalid scan_duration_ms: {metadata['scan_duration_ms']}")
+            if type(metadata['scan_duration_ms']) is not int or metadata['scan_duration_ms'] < 0:
+                add_error(("Invalid scan_duration_ms: {}", metadata['scan_duration_ms']))
     
     if 'artifacts' in data:
         artifacts = data['artifacts']
-        required_artifacts = ['system_info', 'running_processes', 'network_connections', 
-                            'persistence_mechanisms', 'event_logs', 'execution_evidence']
-        for key in required_artifacts:
+        for key in _REQUIRED_ARTIFACTS:
             if key not in artifacts:
-                errors.append(f"Missing required artifacts key: {key}")
+                add_error(("Missing required artifacts key: {}", key))
     
     return errors, warnings
 
@@ -61,52 +145,54 @@ def validate_processes(processes):
     """Validate process data"""
     errors = []
     warnings = []
-    
-    if not isinstance(processes, list):
-        errors.append("running_processes must be a list")
+    add_error = errors.append
+    add_warning = warnings.append
+    valid_ts = _valid_ts
+    is_sha256 = _is_sha256
+    suspicious_path = _SUSPICIOUS_PATH_RE.search
+    
+    if not isinstance(processes, _ARRAY_TYPES):
+        add_error(("running_processes must be a list",))
         return errors, warnings
     
     for i, process in enumerate(processes):
-        if not isinstance(process, dict):
-            errors.append(f"Process {i} is not a dictionary")
+        if type(process) is not dict:
+            add_error(("Process {} is not a dictionary", i))
             continue
         
         # Check required fields
-        required_fields = ['pid', 'parent_pid', 'name', 'command_line', 'executable_path', 'start_time']
-        for field in required_fields:
+        for field in _PROCESS_FIELDS:
             if field not in process:
-                errors.append(f"Process {i} missing required field: {field}")
+                add_error(("Process {} missing required field: {}", i, field))
         
         # Validate PID
         if 'pid' in process:
-            if not isinstance(process['pid'], int) or process['pid'] < 0:
-                errors.append(f"Process {i} has invalid PID: {process['pid']}")
+            if type(process['pid']) is not int or process['pid'] < 0:
+                add_error(("Process {} has invalid PID: {}", i, process['pid']))
         
         # Validate parent PID
         if 'parent_pid' in process:
-            if not isinstance(process['parent_pid'], int) or process['parent_pid'] < 0:
-                errors.append(f"Process {i} has invalid parent PID: {process['parent_pid']}")
+            if type(process['parent_pid']) is not int or process['parent_pid'] < 0:
+                add_error(("Process {} has invalid parent PID: {}", i, process['parent_pid']))
         
         # Validate SHA-256 hash format
-        if 'sha256_hash' in process and process['sha256_hash'] is not None:
-            if not re.match(r'^[a-fA-F0-9]{64}$', process['sha256_hash']):
-                errors.append(f"Process {i} has invalid SHA-256 hash format: {process['sha256_hash']}")
+        sha256_hash = process.get('sha256_hash')
+        if sha256_hash is not None and not is_sha256(sha256_hash):
+            add_error(("Process {} has invalid SHA-256 hash format: {}", i, sha256_hash))
         
         # Validate timestamp
         if 'start_time' in process:
-            try:
-                datetime.fromisoformat(process['start_time'].replace('Z', '+00:00'))
-            except ValueError:
-                errors.append(f"Process {i} has invalid start_time format: {process['start_time']}")
+            if not valid_ts(process['start_time']):
+                add_error(("Process {} has invalid start_time format: {}", i, process['start_time']))
         
         # Check for suspicious indicators
         if 'executable_path' in process:
-            path = process['executable_path'].lower()
-            if any(sus in path for sus in ['temp', 'appdata\\local\\temp', 'downloads']):
-                warnings.append(f"Process {i} ({process.get('name', 'unknown')}) in suspicious location: {process['executable_path']}")
+            path = process['executable_path']
+            if suspicious_path(path):
+                add_warning(("Process {} ({}) in suspicious location: {}", i, process.get('name', 'unknown'), path))
         
-        if 'sha256_hash' not in process or process['sha256_hash'] is None:
-            warnings.append(f"Process {i} ({process.get('name', 'unknown')}) has no SHA-256 hash (unsigned)")
+        if sha256_hash is None:
+            add_warning(("Process {} ({}) has no SHA-256 hash (unsigned)", i, process.get('name', 'unknown')))
     
     return errors, warnings
 
@@ -114,54 +200,48 @@ def validate_network_connections(connections):
     """Validate network connection data"""
     errors = []
     warnings = []
+    add_error = errors.append
+    add_warning = warnings.append
+    is_private_ip = _is_private_ip
     
-    if not isinstance(connections, list):
-        errors.append("network_connections must be a list")
+    if not isinstance(connections, _ARRAY_TYPES):
+        add_error(("network_connections must be a list",))
         return errors, warnings
     
-    valid_protocols = ['TCP', 'UDP']
-    valid_states = ['LISTENING', 'ESTABLISHED', 'TIME_WAIT', 'CLOSE_WAIT', 
-                   'FIN_WAIT1', 'FIN_WAIT2', 'SYN_SENT', 'SYN_RECV', 'LAST_ACK', 'CLOSED']
-    
     for i, conn in enumerate(connections):
-        if not isinstance(conn, dict):
-            errors.append(f"Connection {i} is not a dictionary")
+        if type(conn) is not dict:
+            add_error(("Connection {} is not a dictionary", i))
             continue
         
         # Check required fields
-        required_fields = ['protocol', 'local_address', 'remote_address', 'state', 'owning_pid']
-        for field in required_fields:
+        for field in _CONNECTION_FIELDS:
             if field not in conn:
-                errors.append(f"Connection {i} missing required field: {field}")
+                add_error(("Connection {} missing required field: {}", i, field))
         
         # Validate protocol
-        if 'protocol' in conn and conn['protocol'] not in valid_protocols:
-            errors.append(f"Connection {i} has invalid protocol: {conn['protocol']}")
+        if 'protocol' in conn and (type(conn['protocol']) is not str or conn['protocol'] not in _VALID_PROTOCOLS):
+            add_error(("Connection {} has invalid protocol: {}", i, conn['protocol']))
         
         # Validate state
-        if 'state' in conn and conn['state'] not in valid_states:
-            errors.append(f"Connection {i} has invalid state: {conn['state']}")
+        if 'state' in conn and (type(conn['state']) is not str or conn['state'] not in _VALID_STATES):
+            add_error(("Connection {} has invalid state: {}", i, conn['state']))
         
         # Validate address format
         for addr_field in ['local_address', 'remote_address']:
             if addr_field in conn:
                 if ':' not in conn[addr_field]:
-                    errors.append(f"Connection {i} has invalid {addr_field} format: {conn[addr_field]}")
+                    add_error(("Connection {} has invalid {} format: {}", i, addr_field, conn[addr_field]))
         
         # Validate PID
         if 'owning_pid' in conn:
-            if not isinstance(conn['owning_pid'], int) or conn['owning_pid'] < 0:
-                errors.append(f"Connection {i} has invalid owning_pid: {conn['owning_pid']}")
+            if type(conn['owning_pid']) is not int or conn['owning_pid'] < 0:
+                add_error(("Connection {} has invalid owning_pid: {}", i, conn['owning_pid']))
         
         # Check for external connections
         if 'remote_address' in conn:
             remote_ip = conn['remote_address'].split(':')[0]
-            private_ranges = ['127.', '192.168.', '10.', '172.16.', '172.17.', '172.18.', '172.19.',
-                            '172.20.', '172.21.', '172.22.', '172.23.', '172.24.', '172.25.',
-                            '172.26.', '172.27.', '172.28.', '172.29.', '172.30.', '172.31.']
-            
-            if not any(remote_ip.startswith(prefix) for prefix in private_ranges):
-                warnings.append(f"Connection {i} to external address: {conn['remote_address']}")
+            if not is_private_ip(remote_ip):
+                add_warning(("Connection {} to external address: {}", i, conn['remote_address']))
     
     return errors, warnings
 
@@ -169,33 +249,33 @@ def validate_persistence_mechanisms(mechanisms):
     """Validate persistence mechanism data"""
     errors = []
     warnings = []
+    add_error = errors.append
+    add_warning = warnings.append
+    suspicious_command = _SUSPICIOUS_COMMAND_RE.search
     
-    if not isinstance(mechanisms, list):
-        errors.append("persistence_mechanisms must be a list")
+    if not isinstance(mechanisms, _ARRAY_TYPES):
+        add_error(("persistence_mechanisms must be a list",))
         return errors, warnings
     
-    valid_types = ['Registry Run Key', 'Scheduled Task', 'Service', 'Startup Folder', 'WMI Event', 'DLL Hijacking']
-    
     for i, mech in enumerate(mechanisms):
-        if not isinstance(mech, dict):
-            errors.append(f"Persistence mechanism {i} is not a dictionary")
+        if type(mech) is not dict:
+            add_error(("Persistence mechanism {} is not a dictionary", i))
             continue
         
         # Check required fields
-        required_fields = ['type', 'name', 'command', 'source']
-        for field in required_fields:
+        for field in _PERSISTENCE_FIELDS:
             if field not in mech:
-                errors.append(f"Persistence mechanism {i} missing required field: {field}")
+                add_error(("Persistence mechanism {} missing required field: {}", i, field))
         
         # Validate type
-        if 'type' in mech and mech['type'] not in valid_types:
-            warnings.append(f"Persistence mechanism {i} has unknown type: {mech['type']}")
+        if 'type' in mech and (type(mech['type']) is not str or mech['type'] not in _VALID_PERSISTENCE_TYPES):
+            add_warning(("Persistence mechanism {} has unknown type: {}", i, mech['type']))
         
         # Check for suspicious commands
         if 'command' in mech:
-            command = mech['command'].lower()
-            if any(sus in command for sus in ['powershell', 'cmd', 'temp', 'appdata']):
-                warnings.append(f"Persistence mechanism {i} has suspicious command: {mech['command']}")
+            command = mech['command']
+            if suspicious_command(command):
+                add_warning(("Persistence mechanism {} has suspicious command: {}", i, command))
     
     return errors, warnings
 
@@ -203,49 +283,45 @@ def validate_event_logs(event_logs):
     """Validate event log data"""
     errors = []
     warnings = []
+    add_error = errors.append
+    valid_ts = _valid_ts
     
     if not isinstance(event_logs, dict):
-        errors.append("event_logs must be a dictionary")
+        add_error(("event_logs must be a dictionary",))
         return errors, warnings
     
-    required_logs = ['security', 'system', 'application']
-    valid_levels = ['Critical', 'Error', 'Warning', 'Information', 'Verbose']
-    
-    for log_type in required_logs:
+    for log_type in _REQUIRED_EVENT_LOGS:
         if log_type not in event_logs:
-            errors.append(f"Missing event log type: {log_type}")
+            add_error(("Missing event log type: {}", log_type))
             continue
         
-        if not isinstance(event_logs[log_type], list):
-            errors.append(f"Event log {log_type} must be a list")
+        if not isinstance(event_logs[log_type], _ARRAY_TYPES):
+            add_error(("Event log {} must be a list", log_type))
             continue
         
         for i, event in enumerate(event_logs[log_type]):
-            if not isinstance(event, dict):
-                errors.append(f"Event {i} in {log_type} log is not a dictionary")
+            if type(event) is not dict:
+                add_error(("Event {} in {} log is not a dictionary", i, log_type))
                 continue
             
             # Check required fields
-            required_fields = ['event_id', 'level', 'timestamp', 'source', 'message']
-            for field in required_fields:
+            for field in _EVENT_FIELDS:
                 if field not in event:
-                    errors.append(f"Event {i} in {log_type} log missing required field: {field}")
+                    add_error(("Event {} in {} log missing required field: {}", i, log_type, field))
             
             # Validate event ID
             if 'event_id' in event:
-                if not isinstance(event['event_id'], int) or event['event_id'] < 0:
-                    errors.append(f"Event {i} in {log_type} log has invalid event_id: {event['event_id']}")
+                if type(event['event_id']) is not int or event['event_id'] < 0:
+                    add_error(("Event {} in {} log has invalid event_id: {}", i, log_type, event['event_id']))
             
             # Validate level
-            if 'level' in event and event['level'] not in valid_levels:
-                errors.append(f"Event {i} in {log_type} log has invalid level: {event['level']}")
+            if 'level' in event and (type(event['level']) is not str or event['level'] not in _VALID_EVENT_LEVELS):
+                add_error(("Event {} in {} log has invalid level: {}", i, log_type, event['level']))
             
             # Validate timestamp
             if 'timestamp' in event:
-                try:
-                    datetime.fromisoformat(event['timestamp'].replace('Z', '+00:00'))
-                except ValueError:
-                    errors.append(f"Event {i} in {log_type} log has invalid timestamp: {event['timestamp']}")
+                if not valid_ts(event['timestamp']):
+                    add_error(("Event {} in {} log has invalid timestamp: {}", i, log_type, event['timestamp']))
     
     return errors, warnings
 
@@ -253,72 +329,68 @@ def validate_execution_evidence(execution_evidence):
     """Validate execution evidence data"""
     errors = []
     warnings = []
+    add_error = errors.append
+    valid_ts = _valid_ts
     
     if not isinstance(execution_evidence, dict):
-        errors.append("execution_evidence must be a dictionary")
+        add_error(("execution_evidence must be a dictionary",))
         return errors, warnings
     
     # Validate prefetch files
     if 'prefetch_files' in execution_evidence:
         prefetch_files = execution_evidence['prefetch_files']
-        if not isinstance(prefetch_files, list):
-            errors.append("prefetch_files must be a list")
+        if not isinstance(prefetch_files, _ARRAY_TYPES):
+            add_error(("prefetch_files must be a list",))
         else:
             for i, pf in enumerate(prefetch_files):
-                if not isinstance(pf, dict):
-                    errors.append(f"Prefetch file {i} is not a dictionary")
+                if type(pf) is not dict:
+                    add_error(("Prefetch file {} is not a dictionary", i))
                     continue
                 
                 # Check required fields
-                required_fields = ['filename', 'executable_name', 'run_count', 'last_run_time', 'file_paths']
-                for field in required_fields:
+                for field in _PREFETCH_FIELDS:
                     if field not in pf:
-                        errors.append(f"Prefetch file {i} missing required field: {field}")
+                        add_error(("Prefetch file {} missing required field: {}", i, field))
                 
                 # Validate filename format
                 if 'filename' in pf and not pf['filename'].endswith('.pf'):
-                    errors.append(f"Prefetch file {i} has invalid filename format: {pf['filename']}")
+                    add_error(("Prefetch file {} has invalid filename format: {}", i, pf['filename']))
                 
                 # Validate run count
                 if 'run_count' in pf:
-                    if not isinstance(pf['run_count'], int) or pf['run_count'] < 0:
-                        errors.append(f"Prefetch file {i} has invalid run_count: {pf['run_count']}")
+                    if type(pf['run_count']) is not int or pf['run_count'] < 0:
+                        add_error(("Prefetch file {} has invalid run_count: {}", i, pf['run_count']))
                 
                 # Validate timestamp
                 if 'last_run_time' in pf:
-                    try:
-                        datetime.fromisoformat(pf['last_run_time'].replace('Z', '+00:00'))
-                    except ValueError:
-                        errors.append(f"Prefetch file {i} has invalid last_run_time: {pf['last_run_time']}")
+                    if not valid_ts(pf['last_run_time']):
+                        add_error(("Prefetch file {} has invalid last_run_time: {}", i, pf['last_run_time']))
     
     # Validate shimcache entries
     if 'shimcache_entries' in execution_evidence:
         shimcache_entries = execution_evidence['shimcache_entries']
-        if not isinstance(shimcache_entries, list):
-            errors.append("shimcache_entries must be a list")
+        if not isinstance(shimcache_entries, _ARRAY_TYPES):
+            add_error(("shimcache_entries must be a list",))
         else:
             for i, entry in enumerate(shimcache_entries):
-                if not isinstance(entry, dict):
-                    errors.append(f"Shimcache entry {i} is not a dictionary")
+                if type(entry) is not dict:
+                    add_error(("Shimcache entry {} is not a dictionary", i))
                     continue
                 
                 # Check required fields
-                required_fields = ['path', 'last_modified', 'file_size']
-                for field in required_fields:
+                for field in _SHIMCACHE_FIELDS:
                     if field not in entry:
-                        errors.append(f"Shimcache entry {i} missing required field: {field}")
+                        add_error(("Shimcache entry {} missing required field: {}", i, field))
                 
                 # Validate file size
                 if 'file_size' in entry:
-                    if not isinstance(entry['file_size'], int) or entry['file_size'] < 0:
-                        errors.append(f"Shimcache entry {i} has invalid file_size: {entry['file_size']}")
+                    if type(entry['file_size']) is not int or entry['file_size'] < 0:
+                        add_error(("Shimcache entry {} has invalid file_size: {}", i, entry['file_size']))
                 
                 # Validate timestamp
                 if 'last_modified' in entry:
-                    try:
-                        datetime.fromisoformat(entry['last_modified'].replace('Z', '+00:00'))
-                    except ValueError:
-                        errors.append(f"Shimcache entry {i} has invalid last_modified: {entry['last_modified']}")
+                    if not valid_ts(entry['last_modified']):
+                        add_error(("Shimcache entry {} has invalid last_modified: {}", i, entry['last_modified']))
     
     return errors, warnings
 
@@ -326,41 +398,45 @@ def validate_collection_log(collection_log):
     """Validate collection log data"""
     errors = []
     warnings = []
+    add_error = errors.append
+    valid_ts = _valid_ts
     
-    if not isinstance(collection_log, list):
-        errors.append("collection_log must be a list")
+    if not isinstance(collection_log, _ARRAY_TYPES):
+        add_error(("collection_log must be a list",))
         return errors, warnings
     
-    valid_levels = ['ERROR', 'WARN', 'INFO', 'DEBUG']
-    
     for i, log_entry in enumerate(collection_log):
-        if not isinstance(log_entry, dict):
-            errors.append(f"Log entry {i} is not a dictionary")
+        if type(log_entry) is not dict:
+            add_error(("Log entry {} is not a dictionary", i))
             continue
         
         # Check required fields
-        required_fields = ['timestamp', 'level', 'message']
-        for field in required_fields:
+        for field in _LOG_ENTRY_FIELDS:
             if field not in log_entry:
-                errors.append(f"Log entry {i} missing required field: {field}")
+                add_error(("Log entry {} missing required field: {}", i, field))
         
         # Validate level
-        if 'level' in log_entry and log_entry['level'] not in valid_levels:
-            errors.append(f"Log entry {i} has invalid level: {log_entry['level']}")
+        if 'level' in log_entry and (type(log_entry['level']) is not str or log_entry['level'] not in _VALID_LOG_LEVELS):
+            add_error(("Log entry {} has invalid level: {}", i, log_entry['level']))
         
         # Validate timestamp
         if 'timestamp' in log_entry:
-            try:
-                datetime.fromisoformat(log_entry['timestamp'].replace('Z', '+00:00'))
-            except ValueError:
-                errors.append(f"Log entry {i} has invalid timestamp: {log_entry['timestamp']}")
+            if not valid_ts(log_entry['timestamp']):
+                add_error(("Log entry {} has invalid timestamp: {}", i, log_entry['timestamp']))
     
     return errors, warnings
 
+def _collect_process_pids(processes):
+    """Collect the set of process PIDs, streaming only the pid values when possible"""
+    if isinstance(processes, StreamedArray):
+        return set(processes.field_values('pid'))
+    return {p['pid'] for p in processes if 'pid' in p}
+
 def perform_integrity_checks(data):
     """Perform cross-reference integrity checks"""
     errors = []
     warnings = []
+    add_warning = warnings.append
     
     if 'artifacts' not in data:
         return errors, warnings
@@ -369,27 +445,57 @@ def perform_integrity_checks(data):
     
     # Check if all network connection PIDs exist in process list
     if 'running_processes' in artifacts and 'network_connections' in artifacts:
-        process_pids = {p['pid'] for p in artifacts['running_processes'] if 'pid' in p}
+        process_pids = _collect_process_pids(artifacts['running_processes'])
         
         for i, conn in enumerate(artifacts['network_connections']):
             if 'owning_pid' in conn and conn['owning_pid'] not in process_pids:
-                warnings.append(f"Network connection {i} references non-existent PID: {conn['owning_pid']}")
+                add_warning(("Network connection {} references non-existent PID: {}", i, conn['owning_pid']))
     
     # Check for reasonable data ranges
     if 'running_processes' in artifacts:
         process_count = len(artifacts['running_processes'])
         if process_count == 0:
-            warnings.append("No processes found - this is unusual for a Windows system")
+            add_warning(("No processes found - this is unusual for a Windows system",))
         elif process_count > 1000:
-            warnings.append(f"Very high process count ({process_count}) - verify this is expected")
+            add_warning(("Very high process count ({}) - verify this is expected", process_count))
     
     if 'network_connections' in artifacts:
         conn_count = len(artifacts['network_connections'])
         if conn_count > 500:
-            warnings.append(f"Very high connection count ({conn_count}) - verify this is expected")
+            add_warning(("Very high connection count ({}) - verify this is expected", conn_count))
     
     return errors, warnings
 
+# Artifact sections validated independently: (key, progress message, validator)
+_ARTIFACT_VALIDATORS = (
+    ('running_processes', "🔍 Validating processes...", validate_processes),
+    ('network_connections', "🌐 Validating network connections...", validate_network_connections),
+    ('persistence_mechanisms', "🔄 Validating persistence mechanisms...", validate_persistence_mechanisms),
+    ('event_logs', "📝 Validating event logs...", validate_event_logs),
+    ('execution_evidence', "⚡ Validating execution evidence...", validate_execution_evidence)
+)
+
+def _run_validators(tasks, parallel):
+    """Run (message, validator, argument) tasks, yielding (errors, warnings) in task order
+    
+    With parallel set, and more than one task, each validator runs in its own
+    worker process; otherwise they run one after another as their progress
+    messages are printed.
+    """
+    if not parallel or len(tasks) < 2:
+        for message, validator, argument in tasks:
+            print(message)
+            yield validator(argument)
+        return
+    
+    with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+        futures = []
+        for message, validator, argument in tasks:
+            print(message)
+            futures.append(executor.submit(validator, argument))
+        for future in futures:
+            yield future.result()
+
 def main():
     parser = argparse.ArgumentParser(description='Validate TriageIR JSON output')
     parser.add_argument('input_file', help='TriageIR JSON output file to validate')
@@ -402,8 +508,7 @@ def main():
         print(f"Validating TriageIR JSON file: {args.input_file}")
         
         # Load JSON file
-        with open(args.input_file, 'r') as f:
-            data = json.load(f)
+        data = _load_json(args.input_file)
         
         print("✓ JSON file loaded successfully")
         
@@ -416,48 +521,21 @@ def main():
         all_errors.extend(errors)
         all_warnings.extend(warnings)
         
+        # Validate the artifact sections and collection log
+        tasks = []
         if 'artifacts' in data:
             artifacts = data['artifacts']
-            
-            # Validate processes
-            if 'running_processes' in artifacts:
-                print("🔍 Validating processes...")
-                errors, warnings = validate_processes(artifacts['running_processes'])
-                all_errors.extend(errors)
-                all_warnings.extend(warnings)
-            
-            # Validate network connections
-            if 'network_connections' in artifacts:
-                print("🌐 Validating network connections...")
-                errors, warnings = validate_network_connections(artifacts['network_connections'])
-                all_errors.extend(errors)
-                all_warnings.extend(warnings)
-            
-            # Validate persistence mechanisms
-            if 'persistence_mechanisms' in artifacts:
-                print("🔄 Validating persistence mechanisms...")
-                errors, warnings = validate_persistence_mechanisms(artifacts['persistence_mechanisms'])
-                all_errors.extend(errors)
-                all_warnings.extend(warnings)
-            
-            # Validate event logs
-            if 'event_logs' in artifacts:
-                print("📝 Validating event logs...")
-                errors, warnings = validate_event_logs(artifacts['event_logs'])
-                all_errors.extend(errors)
-                all_warnings.extend(warnings)
-            
-            # Validate execution evidence
-            if 'execution_evidence' in artifacts:
-                print("⚡ Validating execution evidence...")
-                errors, warnings = validate_execution_evidence(artifacts['execution_evidence'])
-                all_errors.extend(errors)
-                all_warnings.extend(warnings)
-        
-        # Validate collection log
+            for key, message, validator in _ARTIFACT_VALIDATORS:
+                if key in artifacts:
+                    tasks.append((message, validator, artifacts[key]))
         if 'collection_log' in data:
-            print("📋 Validating collection log...")
-            errors, warnings = validate_collection_log(data['collection_log'])
+            tasks.append(("📋 Validating collection log...", validate_collection_log, data['collection_log']))
+        
+        # Only streamed scans go to worker processes: their arrays pickle as a
+        # path and prefix and each worker re-reads its own section from disk,
+        # whereas pickling fully loaded sections costs more than validating them
+        parallel = should_stream(args.input_file) and (os.cpu_count() or 1) > 1
+        for errors, warnings in _run_validators(tasks, parallel):
             all_errors.extend(errors)
             all_warnings.extend(warnings)
         
@@ -476,13 +554,13 @@ def main():
             if all_errors:
                 print(f"\n❌ ERRORS ({len(all_errors)}):")
                 for error in all_errors:
-                    print(f"  • {error}")
+                    print(f"  • {_format_finding(error)}")
         
         if args.verbose or all_warnings:
             if all_warnings:
                 print(f"\n⚠️  WARNINGS ({len(all_warnings)}):")
                 for warning in all_warnings:
-                    print(f"  • {warning}")
+                    print(f"  • {_format_finding(warning)}")
         
         # Summary
         print(f"\nSUMMARY:")
@@ -503,7 +581,7 @@ def main():
     except FileNotFoundError:
         print(f"❌ Error: File not found: {args.input_file}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except JSON_ERRORS as e:
         print(f"❌ Error: Invalid JSON format: {e}")
         sys.exit(1)
     except Exception as e: